@@ -1,11 +1,19 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Request, request, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.formparser import FormDataParser, MultiPartParser
+from tempfile import SpooledTemporaryFile
 from flask_cors import CORS
+from flask_compress import Compress
+import orjson
+import hashlib
 import os
 import json
 import traceback
 import logging
 from datetime import datetime
 from src.data_analyzer import DataAnalyzer
+from src.cache import ResponseCache
+from src.utils import UPLOAD_CHUNK_SIZE
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -18,10 +26,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, with native NumPy serialization"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# Uploads are parsed in UPLOAD_CHUNK_SIZE reads and kept in memory up to
+# that size before spilling to disk (Werkzeug defaults: 64KB reads, 500KB spool)
+
+class UploadFormDataParser(FormDataParser):
+    """Form parser that reads multipart bodies in large chunks"""
+    
+    def _parse_multipart(self, stream, mimetype, content_length, options):
+        parser = MultiPartParser(
+            stream_factory=self.stream_factory,
+            max_form_memory_size=self.max_form_memory_size,
+            max_form_parts=self.max_form_parts,
+            cls=self.cls,
+            buffer_size=UPLOAD_CHUNK_SIZE,
+        )
+        boundary = options.get('boundary', '').encode('ascii')
+        
+        if not boundary:
+            raise ValueError("Missing boundary")
+        
+        form, files = parser.parse(stream, boundary, content_length)
+        return stream, form, files
+
+class UploadRequest(Request):
+    """Request class using large upload buffers"""
+    form_data_parser_class = UploadFormDataParser
+    
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=UPLOAD_CHUNK_SIZE, mode='rb+')
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+app.request_class = UploadRequest
 CORS(app, origins=['*'])
 
+# Compress large JSON responses (base64 plots compress well)
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
 # Configure upload folder
 UPLOAD_FOLDER = '/tmp/uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -36,6 +94,13 @@ except Exception as e:
     logger.error(f"Failed to initialize DataAnalyzer: {e}")
     analyzer = None
 
+# Initialize the response cache (no-op unless REDIS_URL is set)
+response_cache = ResponseCache(
+    url=os.environ.get('REDIS_URL'),
+    ttl=int(os.environ.get('CACHE_TTL', 3600)),
+    default=app.json.default
+)
+
 @app.route('/')
 def home():
     """Landing page"""
@@ -74,24 +139,46 @@ def analyze_data():
                 logger.info(f"Processing additional file: {key}")
                 additional_files[key] = file
         
-        # Process the analysis
-        result = analyzer.analyze(questions, additional_files)
+        # Serve repeated requests from the cache
+        cache_status = 'MISS'
+        result = None
+        if response_cache.enabled:
+            cache_key = response_cache.make_key(questions, additional_files)
+            result = response_cache.get(cache_key)
+        
+        if result is not None:
+            cache_status = 'HIT'
+            logger.info("Serving analysis from cache")
+        else:
+            # Process the analysis
+            result = analyzer.analyze(questions, additional_files)
+            if response_cache.enabled:
+                response_cache.set(cache_key, result)
         
         # Calculate processing time
         processing_time = (datetime.now() - start_time).total_seconds()
         logger.info(f"Analysis completed in {processing_time:.2f} seconds")
         
+        # Serialize the result once; it is both hashed for the ETag and
+        # spliced into the body, so base64 charts aren't encoded twice
+        result_json = app.json.dumps(result)
+        
         # Add metadata to result
         if isinstance(result, list):
-            return jsonify(result)
+            body = result_json
         else:
-            return jsonify({
-                "result": result,
-                "metadata": {
-                    "processing_time": processing_time,
-                    "timestamp": start_time.isoformat()
-                }
+            metadata = app.json.dumps({
+                "processing_time": processing_time,
+                "timestamp": start_time.isoformat()
             })
+            body = f'{{"result":{result_json},"metadata":{metadata}}}'
+        response = app.response_class(body, mimetype=app.json.mimetype)
+        response.headers['X-Cache'] = cache_status
+        # Weak ETag over the analysis result only: the per-request metadata
+        # differs between otherwise identical answers
+        result_hash = hashlib.blake2b(result_json.encode('utf-8'), digest_size=16)
+        response.set_etag(result_hash.hexdigest(), weak=True)
+        return response
     
     except ValueError as e:
         logger.error(f"Validation error: {e}")
@@ -11,10 +11,12 @@ from .data_analyzer import DataAnalyzer
 from .gemini_client import GeminiClient
 from .visualization import VisualizationEngine
 from .data_processor import DataProcessor
+from .cache import ResponseCache
 
 __all__ = [
     'DataAnalyzer',
     'GeminiClient', 
     'VisualizationEngine',
-    'DataProcessor'
+    'DataProcessor',
+    'ResponseCache'
 ]
@@ -0,0 +1,87 @@
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+
+from .utils import UPLOAD_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+except ImportError:  # Redis is optional; caching is disabled without it
+    redis = None
+
+
+class ResponseCache:
+    """Redis-backed cache for analysis results keyed by request payload"""
+
+    def __init__(self, url: Optional[str] = None, ttl: int = 3600,
+                 default: Optional[Callable[[Any], Any]] = None):
+        self.ttl = ttl
+        self.client = None
+        # Fallback for types orjson can't serialize; pass the app's JSON
+        # provider default so cached and fresh responses encode alike
+        self.default = default
+
+        if not url:
+            logger.info("Response cache disabled (no REDIS_URL configured)")
+            return
+        if redis is None:
+            logger.warning("Response cache disabled (redis package not installed)")
+            return
+
+        try:
+            self.client = redis.Redis.from_url(url, socket_timeout=2)
+            self.client.ping()
+            logger.info("Response cache connected")
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            self.client = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    def make_key(self, questions: str, files: Dict[str, Any]) -> str:
+        """Hash the questions and every attached file into a cache key"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(questions.encode('utf-8'))
+
+        for name in sorted(files):
+            h.update(b'|' + name.encode('utf-8') + b'|')
+            stream = getattr(files[name], 'stream', files[name])
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                h.update(chunk)
+            stream.seek(0)  # Leave the file ready for the analyzer
+
+        return f"analysis:{h.hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for key, or None on a miss"""
+        if not self.enabled:
+            return None
+        try:
+            cached = self.client.get(key)
+            return orjson.loads(cached) if cached is not None else None
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable result under key"""
+        if not self.enabled:
+            return
+        try:
+            payload = orjson.dumps(
+                value,
+                default=self.default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+            self.client.setex(key, self.ttl, payload)
+        except Exception as e:
+            logger.warning(f"Cache write failed: {e}")
@@ -1,12 +1,54 @@
 import pandas as pd
 import numpy as np
 import json
-import io
-from typing import Dict, Any, Union
+from typing import Dict, Any, Optional, Tuple, Union, BinaryIO
 import logging
+import re
+from functools import lru_cache
+from .utils import Utils
 
 logger = logging.getLogger(__name__)
 
+# Strings that look like ISO (2024-01-31) or slash (1/31/24) dates
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4}')
+
+# Characters that make a 'contains' filter a regex rather than a literal
+_REGEX_META_RE = re.compile(r'[.*+?^${}()|\[\]\\]')
+
+@lru_cache(maxsize=128)
+def _compile_contains(pattern: str) -> re.Pattern:
+    """Compile a case-insensitive 'contains' filter pattern once"""
+    return re.compile(pattern, re.IGNORECASE)
+
+# A path on disk or a seekable binary file-like object (e.g. an upload stream)
+FileSource = Union[str, BinaryIO]
+
+def _rewind(source: FileSource) -> None:
+    """Seek a file-like source back to the start so it can be re-read"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+def _dtype_groups(df: pd.DataFrame) -> Dict[str, pd.Index]:
+    """Group column names by dtype so the pipeline scans dtypes once"""
+    return {
+        'num': df.select_dtypes(include=[np.number]).columns,
+        'obj': df.select_dtypes(include=['object']).columns,
+    }
+
+def _present(cols: pd.Index, df: pd.DataFrame) -> pd.Index:
+    """Restrict a cached column group to columns still present in df"""
+    return cols.intersection(df.columns, sort=False)
+
+def _read_sample(source: FileSource, size: int) -> bytes:
+    """Read up to size bytes from the start of source, leaving it rewound"""
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read(size)
+    _rewind(source)
+    sample = source.read(size)
+    _rewind(source)
+    return sample
+
 class DataProcessor:
     def __init__(self):
         self.supported_formats = ['csv', 'xlsx', 'xls', 'json', 'txt', 'parquet']
@@ -20,21 +62,21 @@ class DataProcessor:
             if file_extension not in self.supported_formats:
                 raise ValueError(f"Unsupported file format: {file_extension}")
             
-            # Read file content
-            file_content = file.read()
-            file.seek(0)  # Reset file pointer
+            # Hand the underlying stream straight to the readers instead of
+            # buffering the whole upload into a bytes object first
+            source = getattr(file, 'stream', file)
             
             # Process based on file type
             if file_extension == 'csv':
-                return self._process_csv(file_content)
+                return self._process_csv(source)
             elif file_extension in ['xlsx', 'xls']:
-                return self._process_excel(file_content)
+                return self._process_excel(source)
             elif file_extension == 'json':
-                return self._process_json(file_content)
+                return self._process_json(source)
             elif file_extension == 'txt':
-                return self._process_text(file_content)
+                return self._process_text(source)
             elif file_extension == 'parquet':
-                return self._process_parquet(file_content)
+                return self._process_parquet(source)
             else:
                 raise ValueError(f"Processing not implemented for {file_extension}")
                 
@@ -42,20 +84,18 @@ class DataProcessor:
             logger.error(f"File processing failed: {e}")
             raise Exception(f"File processing failed: {str(e)}")
     
-    def _process_csv(self, content: bytes) -> pd.DataFrame:
+    def _process_csv(self, source: FileSource) -> pd.DataFrame:
         """Process CSV files"""
         try:
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+            # Sniff the encoding from a sample instead of re-parsing per guess
+            encoding = Utils.detect_encoding(_read_sample(source, 65536))
             
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(io.BytesIO(content), encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError("Could not decode CSV file with any supported encoding")
+            try:
+                df = self._read_csv(source, encoding)
+            except UnicodeDecodeError:
+                # The sample can miss bytes later in the file; latin-1 decodes anything
+                logger.warning(f"CSV is not valid {encoding}, retrying as latin-1")
+                df = self._read_csv(source, 'latin-1')
             
             # Clean column names
             df.columns = df.columns.str.strip()
@@ -69,10 +109,27 @@ class DataProcessor:
         except Exception as e:
             raise Exception(f"CSV processing failed: {str(e)}")
     
-    def _process_excel(self, content: bytes) -> pd.DataFrame:
+    def _read_csv(self, source: FileSource, encoding: str) -> pd.DataFrame:
+        """Read CSV with Arrow's multithreaded parser, falling back to the C parser"""
+        try:
+            _rewind(source)
+            df = pd.read_csv(source, encoding=encoding, engine='pyarrow')
+        except (ImportError, ValueError):  # pyarrow.ArrowInvalid is a ValueError
+            _rewind(source)
+            return pd.read_csv(source, encoding=encoding)
+        
+        # Arrow leaves columns it cannot decode as raw bytes instead of raising
+        for col in df.select_dtypes(include=['object']).columns:
+            first = df[col].first_valid_index()
+            if first is not None and isinstance(df[col].loc[first], bytes):
+                raise UnicodeDecodeError(encoding, b'', 0, 1, f"undecodable column {col!r}")
+        
+        return df
+    
+    def _process_excel(self, source: FileSource) -> pd.DataFrame:
         """Process Excel files"""
         try:
-            df = pd.read_excel(io.BytesIO(content), engine='openpyxl')
+            df = pd.read_excel(source, engine='openpyxl')
             
             # Clean column names
             df.columns = df.columns.str.strip()
@@ -86,10 +143,14 @@ class DataProcessor:
         except Exception as e:
             raise Exception(f"Excel processing failed: {str(e)}")
     
-    def _process_json(self, content: bytes) -> pd.DataFrame:
+    def _process_json(self, source: FileSource) -> pd.DataFrame:
         """Process JSON files"""
         try:
-            json_data = json.loads(content.decode('utf-8'))
+            if isinstance(source, str):
+                with open(source, 'rb') as f:
+                    json_data = json.load(f)
+            else:
+                json_data = json.load(source)
             
             # Handle different JSON structures
             if isinstance(json_data, list):
@@ -110,23 +171,28 @@ class DataProcessor:
         except Exception as e:
             raise Exception(f"JSON processing failed: {str(e)}")
     
-    def _process_text(self, content: bytes) -> pd.DataFrame:
+    def _process_text(self, source: FileSource) -> pd.DataFrame:
         """Process text files (assume CSV-like format)"""
         try:
-            text_content = content.decode('utf-8')
-            
             # Try different delimiters
             delimiters = [',', '\t', ';', '|']
             
             for delimiter in delimiters:
                 try:
-                    df = pd.read_csv(io.StringIO(text_content), sep=delimiter)
+                    _rewind(source)
+                    df = pd.read_csv(source, sep=delimiter, encoding='utf-8')
                     if df.shape[1] > 1:  # Multiple columns found
                         break
                 except:
                     continue
             else:
                 # If no delimiter works, treat as single column
+                _rewind(source)
+                if isinstance(source, str):
+                    with open(source, 'rb') as f:
+                        text_content = f.read().decode('utf-8')
+                else:
+                    text_content = source.read().decode('utf-8')
                 lines = text_content.strip().split('\n')
                 df = pd.DataFrame({'text': lines})
             
@@ -138,10 +204,10 @@ class DataProcessor:
         except Exception as e:
             raise Exception(f"Text processing failed: {str(e)}")
     
-    def _process_parquet(self, content: bytes) -> pd.DataFrame:
+    def _process_parquet(self, source: FileSource) -> pd.DataFrame:
         """Process Parquet files"""
         try:
-            df = pd.read_parquet(io.BytesIO(content))
+            df = pd.read_parquet(source)
             
             logger.info(f"Parquet processed: {df.shape[0]} rows, {df.shape[1]} columns")
             return df
@@ -152,19 +218,21 @@ class DataProcessor:
     def _infer_types(self, df: pd.DataFrame) -> pd.DataFrame:
         """Infer and convert appropriate data types"""
         try:
-            # Convert numeric columns
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    # Try to convert to numeric
-                    numeric_series = pd.to_numeric(df[col], errors='coerce')
-                    if not numeric_series.isna().all():
-                        df[col] = numeric_series
-                    else:
-                        # Try to convert to datetime
-                        try:
-                            df[col] = pd.to_datetime(df[col], errors='coerce')
-                        except:
-                            pass  # Keep as object
+            obj_cols = df.select_dtypes(include=['object']).columns
+            if len(obj_cols) == 0:
+                return df
+            
+            # Convert numeric columns in one pass over all object columns
+            numeric = df[obj_cols].apply(pd.to_numeric, errors='coerce')
+            keep = numeric.notna().any(axis=0)
+            if keep.any():
+                df[obj_cols[keep]] = numeric.loc[:, keep]
+            
+            # Only attempt datetime parsing where a sample looks like dates
+            for col in obj_cols[~keep]:
+                sample = df[col].dropna().head(20).astype(str)
+                if len(sample) and sample.str.match(_DATE_RE).mean() > 0.5:
+                    df[col] = pd.to_datetime(df[col], errors='coerce')
             
             return df
             
@@ -172,9 +240,13 @@ class DataProcessor:
             logger.warning(f"Type inference failed: {e}")
             return df
     
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def clean_data(self, df: pd.DataFrame,
+                   groups: Optional[Dict[str, pd.Index]] = None) -> pd.DataFrame:
         """Basic data cleaning operations"""
         try:
+            if groups is None:
+                groups = _dtype_groups(df)
+            
             # Remove completely empty rows and columns
             df = df.dropna(how='all').dropna(axis=1, how='all')
             
@@ -182,9 +254,11 @@ class DataProcessor:
             df = df.loc[:, ~df.columns.duplicated()]
             
             # Basic string cleaning for object columns
-            for col in df.select_dtypes(include=['object']).columns:
-                df[col] = df[col].astype(str).str.strip()
-                df[col] = df[col].replace('', np.nan)
+            for col in _present(groups['obj'], df):
+                # .str.strip() skips the astype(str) copy; it yields NaN for
+                # non-string cells, so fall back to the original value there
+                stripped = df[col].str.strip()
+                df[col] = stripped.where(stripped.notna(), df[col]).replace('', np.nan)
             
             logger.info(f"Data cleaned: {df.shape[0]} rows, {df.shape[1]} columns")
             return df
@@ -193,9 +267,13 @@ class DataProcessor:
             logger.warning(f"Data cleaning failed: {e}")
             return df
     
-    def get_data_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def get_data_summary(self, df: pd.DataFrame,
+                         groups: Optional[Dict[str, pd.Index]] = None) -> Dict[str, Any]:
         """Get summary statistics and info about the data"""
         try:
+            if groups is None:
+                groups = _dtype_groups(df)
+            
             summary = {
                 'shape': df.shape,
                 'columns': df.columns.tolist(),
@@ -205,19 +283,32 @@ class DataProcessor:
             }
             
             # Numeric summary
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            numeric_cols = _present(groups['num'], df)
             if len(numeric_cols) > 0:
                 summary['numeric_summary'] = df[numeric_cols].describe().to_dict()
             
             # Categorical summary
-            cat_cols = df.select_dtypes(include=['object']).columns
+            cat_cols = _present(groups['obj'], df)
             if len(cat_cols) > 0:
-                summary['categorical_summary'] = {}
-                for col in cat_cols:
-                    summary['categorical_summary'][col] = {
-                        'unique_count': df[col].nunique(),
-                        'top_values': df[col].value_counts().head().to_dict()
-                    }
+                # One grouped count over all categorical columns instead of
+                # a value_counts() scan per column
+                nunique = df[cat_cols].nunique().to_dict()
+                # Melt over positional labels so no column name can clash
+                # with melt's own 'variable'/'value' columns
+                counts = (df[cat_cols]
+                          .set_axis(range(len(cat_cols)), axis=1)
+                          .melt()
+                          .groupby(['variable', 'value'], sort=False)
+                          .size())
+                top = counts.groupby(level=0, group_keys=False).nlargest(5)
+                
+                summary['categorical_summary'] = {
+                    col: {'unique_count': nunique[col], 'top_values': {}}
+                    for col in cat_cols
+                }
+                for (pos, value), count in top.items():
+                    col = cat_cols[pos]
+                    summary['categorical_summary'][col]['top_values'][value] = int(count)
             
             return summary
             
@@ -225,10 +316,18 @@ class DataProcessor:
             logger.error(f"Summary generation failed: {e}")
             return {'error': str(e)}
     
+    def prepare_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Clean a processed DataFrame and summarize it with one dtype scan"""
+        groups = _dtype_groups(df)
+        df = self.clean_data(df, groups)
+        return df, self.get_data_summary(df, groups)
+    
     def filter_data(self, df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
         """Apply filters to the data"""
         try:
-            filtered_df = df.copy()
+            # Collect every condition as a boolean array and slice once;
+            # missing values in nullable columns count as no match
+            masks = []
             
             for column, condition in filters.items():
                 if column not in df.columns:
@@ -236,14 +335,27 @@ class DataProcessor:
                     
                 if isinstance(condition, dict):
                     if 'min' in condition:
-                        filtered_df = filtered_df[filtered_df[column] >= condition['min']]
+                        masks.append(df[column].ge(condition['min']).to_numpy(dtype=bool, na_value=False))
                     if 'max' in condition:
-                        filtered_df = filtered_df[filtered_df[column] <= condition['max']]
+                        masks.append(df[column].le(condition['max']).to_numpy(dtype=bool, na_value=False))
                     if 'equals' in condition:
-                        filtered_df = filtered_df[filtered_df[column] == condition['equals']]
+                        masks.append(df[column].eq(condition['equals']).to_numpy(dtype=bool, na_value=False))
                     if 'contains' in condition:
-                        filtered_df = filtered_df[filtered_df[column].str.contains(
-                            condition['contains'], case=False, na=False)]
+                        needle = condition['contains']
+                        if isinstance(needle, str) and not _REGEX_META_RE.search(needle):
+                            # Literal substring search skips the regex engine
+                            contains = df[column].str.contains(
+                                needle, case=False, regex=False, na=False)
+                        else:
+                            contains = df[column].str.contains(
+                                _compile_contains(needle), na=False)
+                        masks.append(contains.to_numpy(dtype=bool, na_value=False))
+            
+            # Boolean indexing already returns a new frame, so no upfront copy
+            if masks:
+                filtered_df = df[np.logical_and.reduce(masks)]
+            else:
+                filtered_df = df
                 
             logger.info(f"Data filtered: {len(filtered_df)} rows remaining")
             return filtered_df
@@ -4,33 +4,55 @@ import hashlib
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 import requests
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # Fall back to parsing whole pages with pandas
+    LexborHTMLParser = None
 from datetime import datetime
+import io
 import os
+import codecs
+import shutil
+import sys
+import time
 
 logger = logging.getLogger(__name__)
 
+SCRAPE_CACHE_DIR = os.environ.get('SCRAPE_CACHE_DIR', '/tmp/scrape_cache')
+SCRAPE_CACHE_TTL = 24 * 60 * 60  # Scraped tables rarely change within a day
+
+# Buffer size shared by the upload parser, cache-key hashing and save_upload
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+ENCODING_CONFIDENCE = 0.5  # Below this, chardet's encoding guess is ignored
+DEFAULT_ENCODING = 'cp1252'  # Used when the guess is too unsure
+
+# Patterns are compiled once at import time
+_URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+_QUESTION_SPLITTERS = [
+    re.compile(r'\d+\.\s*'),  # 1. 2. 3.
+    re.compile(r'\d+\)\s*'),  # 1) 2) 3)
+    re.compile(r'-\s*'),      # - question
+    re.compile(r'\*\s*'),     # * question
+]
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.,!?-]')
+
 class Utils:
     @staticmethod
     def extract_urls(text: str) -> List[str]:
         """Extract URLs from text"""
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        urls = re.findall(url_pattern, text)
+        urls = _URL_RE.findall(text)
         return urls
     
     @staticmethod
     def extract_questions(text: str) -> List[str]:
         """Extract individual questions from text"""
         # Split by numbers (1., 2., etc.) or dashes
-        patterns = [
-            r'\d+\.\s*',  # 1. 2. 3.
-            r'\d+\)\s*',  # 1) 2) 3)
-            r'-\s*',      # - question
-            r'\*\s*',     # * question
-        ]
-        
         questions = []
-        for pattern in patterns:
-            parts = re.split(pattern, text)
+        for pattern in _QUESTION_SPLITTERS:
+            parts = pattern.split(text)
             if len(parts) > 1:
                 questions = [part.strip() for part in parts[1:] if part.strip()]
                 break
@@ -112,8 +134,60 @@ class Utils:
     @staticmethod
     def generate_cache_key(*args) -> str:
         """Generate a cache key from arguments"""
-        combined = ''.join(str(arg) for arg in args)
-        return hashlib.md5(combined.encode()).hexdigest()
+        # repr() keeps ('a', 'b') and ('ab',) distinct; feeding the hash
+        # incrementally avoids building one large joined string
+        h = hashlib.blake2b(digest_size=16)
+        for arg in args:
+            h.update(repr(arg).encode())
+            h.update(b'\x00')
+        return h.hexdigest()
+    
+    @staticmethod
+    def scrape_table(url: str, table_index: int = 0, ttl: int = SCRAPE_CACHE_TTL):
+        """Scrape an HTML table from a URL, caching the result on disk as Parquet"""
+        import pandas as pd
+        
+        cache_path = os.path.join(
+            SCRAPE_CACHE_DIR, f"{Utils.generate_cache_key(url, table_index)}.parquet")
+        
+        try:
+            if time.time() - os.path.getmtime(cache_path) < ttl:
+                logger.info(f"Using cached table for {url}")
+                return pd.read_parquet(cache_path)
+        except OSError:
+            pass  # Not cached yet
+        
+        response = Utils.safe_request(url)
+        if response is None:
+            raise ValueError(f"Could not fetch {url}")
+        
+        html = response.text
+        if LexborHTMLParser is not None:
+            # Locate the table with the fast lexbor parser so pandas only has
+            # to parse and build a DataFrame for that one table. Skip tables
+            # without text, as read_html does, so table_index means the same
+            # table on both paths
+            tables = [t for t in LexborHTMLParser(html).css('table') if t.text(strip=True)]
+            if table_index >= len(tables):
+                raise ValueError(f"No table {table_index} found at {url}")
+            df = pd.read_html(io.StringIO(tables[table_index].html))[0]
+        else:
+            tables = pd.read_html(io.StringIO(html))
+            if table_index >= len(tables):
+                raise ValueError(f"No table {table_index} found at {url}")
+            df = tables[table_index]
+        
+        # Write to a temp file and rename so concurrent workers never read
+        # a half-written cache entry
+        try:
+            os.makedirs(SCRAPE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to cache table for {url}: {e}")
+        
+        return df
     
     @staticmethod
     def format_number(num: float, precision: int = 6) -> str:
@@ -154,10 +228,10 @@ class Utils:
             return str(text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = _WHITESPACE_RE.sub(' ', text.strip())
         
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.,!?-]', '', text)
+        text = _SPECIAL_CHARS_RE.sub('', text)
         
         return text
     
@@ -182,6 +256,42 @@ class Utils:
         except:
             return 0.0
     
+    @staticmethod
+    def save_upload(src_file, dst_path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> int:
+        """Save an uploaded file to disk, using zero-copy sendfile when possible"""
+        stream = getattr(src_file, 'stream', src_file)
+        stream.seek(0)
+        
+        # A SpooledTemporaryFile only has a real descriptor once it has rolled
+        # over to disk; asking for fileno() earlier would force that rollover
+        src_fd = None
+        if sys.platform == 'linux' and getattr(stream, '_rolled', True):
+            try:
+                stream.flush()
+                src_fd = stream.fileno()
+            except (AttributeError, io.UnsupportedOperation):
+                pass  # In-memory stream, e.g. BytesIO
+        
+        with open(dst_path, 'wb') as dst:
+            if src_fd is not None:
+                try:
+                    size = os.fstat(src_fd).st_size
+                    offset = 0
+                    while offset < size:
+                        sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                    return offset
+                except OSError as e:
+                    logger.warning(f"sendfile failed, falling back to buffered copy: {e}")
+                    stream.seek(0)
+                    dst.seek(0)
+                    dst.truncate()
+            
+            shutil.copyfileobj(stream, dst, chunk_size)
+            return dst.tell()
+    
     @staticmethod
     def is_numeric_column(series) -> bool:
         """Check if a pandas series is numeric"""
@@ -193,14 +303,25 @@ class Utils:
     
     @staticmethod
     def detect_encoding(file_content: bytes) -> str:
-        """Detect file encoding"""
-        import chardet
+        """Detect file encoding from its content (or a leading sample of it)"""
+        try:
+            # final=False tolerates a multi-byte character cut off by a sample
+            codecs.getincrementaldecoder('utf-8')().decode(file_content, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
         
         try:
+            import chardet
             result = chardet.detect(file_content)
-            return result['encoding'] or 'utf-8'
-        except:
-            return 'utf-8'
+        except Exception:
+            return DEFAULT_ENCODING
+        
+        # Short samples give chardet little to go on and its low-confidence
+        # guesses are often exotic codepages; Western text is far more likely
+        if result['encoding'] and (result['confidence'] or 0) >= ENCODING_CONFIDENCE:
+            return result['encoding']
+        return DEFAULT_ENCODING
 
 # Helper functions for common operations
 def safe_divide(a, b, default=0):
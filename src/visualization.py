@@ -1,47 +1,309 @@
+import matplotlib
+matplotlib.use('Agg')  # Use non-GUI backend (must precede pyplot import)
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import seaborn as sns
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 import pandas as pd
 import numpy as np
-import base64
 import io
+import os
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
-import matplotlib
-matplotlib.use('Agg')  # Use non-GUI backend
+
+try:
+    import pybase64 as base64  # SIMD base64, drop-in for the stdlib module
+except ImportError:
+    import base64
+
+# Set style for better looking plots (once per process, not per engine)
+plt.style.use('dark_background')
+sns.set_palette("husl")
+
+# Don't let Kaleido fetch MathJax on every export
+if getattr(pio, 'kaleido', None) is not None and getattr(pio.kaleido, 'scope', None) is not None:
+    pio.kaleido.scope.mathjax = None
+
+try:
+    import imagecodecs  # libdeflate-backed PNG encoder
+except ImportError:  # Pillow's zlib encoder is used instead
+    imagecodecs = None
+
+try:
+    import xxhash  # Faster fingerprinting of chart data
+except ImportError:  # hashlib.blake2b is used instead
+    xxhash = None
+
+try:
+    from numba import njit
+except ImportError:  # Regression falls back to NumPy reductions
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, error_model='numpy')
+    def _ols_kernel(x, y):
+        """Centered least-squares fit in two fused passes with no temporaries"""
+        n = x.size
+        sx = 0.0
+        sy = 0.0
+        for i in range(n):
+            sx += x[i]
+            sy += y[i]
+        x_mean = sx / n
+        y_mean = sy / n
+        
+        sxy = 0.0
+        sxx = 0.0
+        for i in range(n):
+            dx = x[i] - x_mean
+            sxy += dx * (y[i] - y_mean)
+            sxx += dx * dx
+        
+        slope = sxy / sxx
+        return slope, y_mean - slope * x_mean
+else:
+    _ols_kernel = None
+
+def _linear_fit(x, y):
+    """Closed-form least-squares slope and intercept for a degree-1 fit"""
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    if _ols_kernel is not None:
+        return _ols_kernel(x, y)
+    
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    slope = (dx * (y - y_mean)).sum() / (dx * dx).sum()
+    return slope, y_mean - slope * x_mean
+
+def _encode_png(img, level):
+    """Encode an RGB PIL image as PNG bytes (or a view of them), preferring libdeflate over zlib"""
+    if imagecodecs is not None:
+        return imagecodecs.png_encode(np.asarray(img), level=level)
+    
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG', optimize=False, compress_level=level)
+    return buffer.getbuffer()  # Zero-copy view; getvalue() would copy
+
+# Above this many points, plots are downsampled before drawing: the PNG has
+# far fewer pixel columns than that, so extra points only cost render time
+DOWNSAMPLE_THRESHOLD = 5000
+DOWNSAMPLE_TARGET = 4000
+
+MAX_IMAGE_SIZE = 800  # Longest side of rendered charts, in pixels
+
+CHART_CACHE_SIZE = 128  # Rendered charts kept per engine
+
+FIGURE_POOL_SIZE = 4  # Idle figures kept per size for reuse
+
+def _as_float(values):
+    """Return values as a float64 array (datetimes as ns), or None if not numeric"""
+    values = np.asarray(values)
+    try:
+        if np.issubdtype(values.dtype, np.datetime64):
+            out = values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+            out[np.isnat(values)] = np.nan
+            return out
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        return None
+
+def _sample_indices(n, target=DOWNSAMPLE_TARGET):
+    """Sorted uniform random sample of row positions (deterministic seed)"""
+    rng = np.random.default_rng(0)
+    return np.sort(rng.choice(n, size=target, replace=False))
+
+def _m4_indices(x, y, target=DOWNSAMPLE_TARGET):
+    """Row positions kept by M4 downsampling: first, last, min and max y per x bucket"""
+    n = len(x)
+    xf = _as_float(x)
+    yf = _as_float(y)
+    if xf is None or yf is None:
+        # Not numeric: fall back to an even stride that keeps point order
+        return np.linspace(0, n - 1, target, dtype=np.int64)
+    
+    positions = np.flatnonzero(np.isfinite(xf))
+    xs = xf[positions]
+    ys = yf[positions]
+    if positions.size == 0:
+        return positions
+    span = xs.max() - xs.min()
+    if not span > 0:
+        # Constant x: bucketing is meaningless, take an even stride instead
+        count = min(target, positions.size)
+        return positions[np.linspace(0, positions.size - 1, count, dtype=np.int64)]
+    
+    n_buckets = max(target // 4, 1)
+    buckets = np.minimum(((xs - xs.min()) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    
+    # Rows grouped by bucket (stable, so original order within a bucket),
+    # then by ascending / descending y with NaN sorted last
+    by_bucket = np.argsort(buckets, kind='stable')
+    by_min = np.lexsort((np.where(np.isnan(ys), np.inf, ys), buckets))
+    by_max = np.lexsort((np.where(np.isnan(ys), np.inf, -ys), buckets))
+    
+    sorted_buckets = buckets[by_bucket]
+    starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    ends = np.r_[starts[1:], sorted_buckets.size] - 1
+    
+    keep = np.concatenate([by_bucket[starts], by_bucket[ends], by_min[starts], by_max[starts]])
+    return positions[np.unique(keep)]
+
+def _data_fingerprint(data):
+    """Hash a DataFrame's values, index, columns and dtypes for cache lookups"""
+    row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    h = xxhash.xxh64() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    h.update(row_hashes.tobytes())
+    h.update(repr([(str(c), str(t)) for c, t in data.dtypes.items()]).encode('utf-8'))
+    return h.digest()
+
+def _dtype_columns(data):
+    """Numeric, categorical and datetime column names, computed once per plot"""
+    return (
+        data.select_dtypes(include=[np.number]).columns.tolist(),
+        data.select_dtypes(include=['object']).columns.tolist(),
+        data.select_dtypes(include=['datetime64']).columns.tolist(),
+    )
+
+_worker_engine = None
+
+def _create_plot_worker(job):
+    """Render one (data, question) job, reusing a per-process engine"""
+    global _worker_engine
+    data, question, prefer_webp = job
+    if _worker_engine is None or _worker_engine.prefer_webp != prefer_webp:
+        _worker_engine = VisualizationEngine(prefer_webp=prefer_webp)
+    return _worker_engine.create_plot(data, question)
 
 class VisualizationEngine:
-    def __init__(self):
-        # Set style for better looking plots
-        plt.style.use('dark_background')
-        sns.set_palette("husl")
+    def __init__(self, prefer_webp=False, max_workers=None):
+        # WebP previews are smaller and faster to encode than PNG; opt-in
+        # because consumers may expect data:image/png URIs
+        self.prefer_webp = prefer_webp
+        
+        # Idle figures by size, checked out per plot and returned after
+        # encoding. A plain locked dict rather than threading.local, which
+        # gevent turns into a greenlet-local that dies with each request
+        self._fig_pool = {}
+        self._fig_pool_lock = threading.Lock()
+        
+        # Worker processes for create_plots, started on first use
+        self.max_workers = max_workers or os.cpu_count()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
+        # Rendered charts by (question, data fingerprint), least recent first
+        self._chart_cache = OrderedDict()
+        self._chart_cache_lock = threading.Lock()
+    
+    def _get_figure(self, figsize):
+        """Check out a cleared pooled figure and a fresh Axes"""
+        with self._fig_pool_lock:
+            idle = self._fig_pool.get(figsize)
+            fig = idle.pop() if idle else None
+        if fig is None:
+            # Constrained layout is solved during the single draw, unlike
+            # tight_layout which needs a draw pass of its own
+            fig = Figure(figsize=figsize, layout='constrained')
+            FigureCanvasAgg(fig)  # Attach once so the renderer is reused too
+            fig._pool_key = figsize
+        fig.clear()
+        return fig, fig.add_subplot(111)
+    
+    def _release_figure(self, fig):
+        """Return a pooled figure for reuse; other figures are ignored"""
+        figsize = getattr(fig, '_pool_key', None)
+        if figsize is None:
+            return
+        with self._fig_pool_lock:
+            idle = self._fig_pool.setdefault(figsize, [])
+            if len(idle) < FIGURE_POOL_SIZE:
+                idle.append(fig)
         
     def create_plot(self, data, question):
         """Create visualizations based on question requirements"""
         try:
             question_lower = question.lower()
             
-            if "scatterplot" in question_lower or "scatter" in question_lower:
-                return self._create_scatterplot(data, question)
-            elif "bar" in question_lower or "histogram" in question_lower:
-                return self._create_bar_chart(data, question)
-            elif "line" in question_lower or "time series" in question_lower:
-                return self._create_line_chart(data, question)
-            elif "pie" in question_lower:
-                return self._create_pie_chart(data, question)
-            else:
-                # Default to scatterplot for correlation analysis
-                return self._create_scatterplot(data, question)
+            # Charts depend only on the lowercased question and the data,
+            # so retries and re-renders can skip matplotlib entirely
+            try:
+                key = (question_lower, self.prefer_webp, _data_fingerprint(data))
+            except TypeError:  # Unhashable cells (lists, dicts); don't cache
+                key = None
+            if key is not None:
+                with self._chart_cache_lock:
+                    cached = self._chart_cache.get(key)
+                    if cached is not None:
+                        self._chart_cache.move_to_end(key)
+                        return cached
+            
+            result = self._render_plot(data, question, question_lower)
+            
+            if key is not None:
+                with self._chart_cache_lock:
+                    self._chart_cache[key] = result
+                    if len(self._chart_cache) > CHART_CACHE_SIZE:
+                        self._chart_cache.popitem(last=False)
+            return result
                 
         except Exception as e:
             raise Exception(f"Visualization creation failed: {str(e)}")
     
-    def _create_scatterplot(self, data, question):
+    def _render_plot(self, data, question, question_lower):
+        """Pick a chart type from the question and render it"""
+        columns = _dtype_columns(data)
+        
+        if "scatterplot" in question_lower or "scatter" in question_lower:
+            return self._create_scatterplot(data, question, *columns)
+        elif "bar" in question_lower or "histogram" in question_lower:
+            return self._create_bar_chart(data, question, *columns)
+        elif "line" in question_lower or "time series" in question_lower:
+            return self._create_line_chart(data, question, *columns)
+        elif "pie" in question_lower:
+            return self._create_pie_chart(data, question, *columns)
+        else:
+            # Default to scatterplot for correlation analysis
+            return self._create_scatterplot(data, question, *columns)
+    
+    def create_plots(self, jobs):
+        """Render a batch of (data, question) pairs across worker processes"""
+        jobs = list(jobs)
+        if len(jobs) <= 1:
+            # Not worth a process hop; render here with this engine's caches
+            return [self.create_plot(data, question) for data, question in jobs]
+        jobs = [(data, question, self.prefer_webp) for data, question in jobs]
+        return list(self._get_pool().map(_create_plot_worker, jobs))
+    
+    def _get_pool(self):
+        """Start the process pool lazily; spawn avoids forking gevent/thread state"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._pool
+    
+    def close(self):
+        """Shut down the worker processes, if any were started"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+    
+    def _create_scatterplot(self, data, question, numeric_cols, cat_cols, date_cols):
         """Create a scatterplot with optional regression line"""
         try:
-            # Determine columns for plotting
-            numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-            
             if len(numeric_cols) < 2:
                 raise ValueError("Need at least 2 numeric columns for scatterplot")
             
@@ -51,26 +313,55 @@ class VisualizationEngine:
             
             # Try to identify columns from question
             if "rank" in question.lower() and "peak" in question.lower():
-                for col in data.columns:
+                for col in numeric_cols:
                     if "rank" in col.lower():
                         x_col = col
                     elif "peak" in col.lower():
                         y_col = col
             
+            # Drop incomplete rows once (this also clears pd.NA, which can't
+            # convert to float); NaN would otherwise poison the fit
+            sub = data[[x_col, y_col]].dropna()
+            
+            # Convert once to contiguous arrays shared by the scatter and the fit
+            xv = np.ascontiguousarray(sub[x_col].to_numpy(dtype=np.float64))
+            yv = np.ascontiguousarray(sub[y_col].to_numpy(dtype=np.float64))
+            
+            # dropna() keeps ±inf, which is undefined in the fastmath fit
+            # kernel and wrecks axis autoscaling
+            finite = np.isfinite(xv) & np.isfinite(yv)
+            if not finite.all():
+                xv = xv[finite]
+                yv = yv[finite]
+            if xv.size == 0:
+                raise ValueError(f"No rows with finite {x_col} and {y_col} values")
+            
             # Create the plot
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig, ax = self._get_figure((10, 8))
             
-            # Scatter plot
-            scatter = ax.scatter(data[x_col], data[y_col], 
-                               alpha=0.7, s=50, c='cyan', edgecolors='white')
+            # Scatter plot (a random subset for large N; the fit uses every point)
+            if xv.size > DOWNSAMPLE_THRESHOLD:
+                idx = _sample_indices(xv.size)
+                px, py = xv[idx], yv[idx]
+            else:
+                px, py = xv, yv
+            # Per-point edge paths are costly and invisible in dense plots
+            dense = px.size >= 500
+            scatter = ax.scatter(px, py, 
+                               alpha=0.7, s=50, c='cyan',
+                               edgecolors='none' if dense else 'white',
+                               linewidths=0 if dense else None)
             
             # Add regression line if requested
             if "regression" in question.lower() or "line" in question.lower():
-                z = np.polyfit(data[x_col], data[y_col], 1)
-                p = np.poly1d(z)
-                ax.plot(data[x_col], p(data[x_col]), 
-                       "r--", linewidth=2, alpha=0.8, label='Regression Line')
-                ax.legend()
+                slope, intercept = _linear_fit(xv, yv)
+                # Constant x gives no defined slope; skip the line then
+                if math.isfinite(slope):
+                    # A straight line only needs its two endpoints
+                    x_ends = np.array([xv.min(), xv.max()])
+                    ax.plot(x_ends, slope * x_ends + intercept, 
+                           "r--", linewidth=2, alpha=0.8, label='Regression Line')
+                    ax.legend()
             
             # Styling
             ax.set_xlabel(x_col, fontsize=12, color='white')
@@ -86,22 +377,22 @@ class VisualizationEngine:
         except Exception as e:
             raise Exception(f"Scatterplot creation failed: {str(e)}")
     
-    def _create_bar_chart(self, data, question):
+    def _create_bar_chart(self, data, question, numeric_cols, cat_cols, date_cols):
         """Create a bar chart"""
         try:
-            # Find categorical and numeric columns
-            cat_cols = data.select_dtypes(include=['object']).columns.tolist()
-            num_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-            
-            if not cat_cols or not num_cols:
+            if not cat_cols or not numeric_cols:
                 raise ValueError("Need categorical and numeric columns for bar chart")
             
             x_col = cat_cols[0]
-            y_col = num_cols[0]
+            y_col = numeric_cols[0]
             
             # Create grouped data if needed
             if len(data) > 20:  # Group if too many categories
-                grouped = data.groupby(x_col)[y_col].mean().sort_values(ascending=False).head(15)
+                # Categorical keys group on integer codes instead of hashing
+                # strings; nlargest avoids a full sort of the group means
+                keys = pd.Categorical(data[x_col])
+                grouped = (data[y_col].groupby(keys, sort=False, observed=True)
+                           .mean().nlargest(15))
                 x_data = grouped.index
                 y_data = grouped.values
             else:
@@ -109,7 +400,7 @@ class VisualizationEngine:
                 y_data = data[y_col]
             
             # Create the plot
-            fig, ax = plt.subplots(figsize=(12, 8))
+            fig, ax = self._get_figure((12, 8))
             bars = ax.bar(range(len(x_data)), y_data, 
                          color='lightblue', alpha=0.8, edgecolor='white')
             
@@ -123,31 +414,44 @@ class VisualizationEngine:
             ax.set_facecolor('#1a1a2e')
             fig.patch.set_facecolor('#0f0f23')
             
-            plt.tight_layout()
             return self._fig_to_base64(fig)
             
         except Exception as e:
             raise Exception(f"Bar chart creation failed: {str(e)}")
     
-    def _create_line_chart(self, data, question):
+    def _create_line_chart(self, data, question, numeric_cols, cat_cols, date_cols):
         """Create a line chart"""
         try:
-            # Find date/time and numeric columns
-            date_cols = data.select_dtypes(include=['datetime64']).columns.tolist()
-            num_cols = data.select_dtypes(include=[np.number]).columns.tolist()
-            
-            if not date_cols and not num_cols:
+            if not date_cols and not numeric_cols:
                 # Use index as x-axis if no date column
                 x_col = data.index
-                y_col = num_cols[0] if num_cols else data.columns[0]
+                y_col = numeric_cols[0] if numeric_cols else data.columns[0]
             else:
                 x_col = date_cols[0] if date_cols else data.columns[0]
-                y_col = num_cols[0] if num_cols else data.columns[1]
+                # Never plot the x column against itself
+                y_candidates = [c for c in numeric_cols if c != x_col]
+                y_col = y_candidates[0] if y_candidates else data.columns[1]
+            
+            x_values = np.asarray(data[x_col] if x_col in data.columns else data.index)
+            y_values = data[y_col].to_numpy()
+            
+            # M4 downsampling keeps the visible envelope of long series
+            if len(x_values) > DOWNSAMPLE_THRESHOLD:
+                idx = _m4_indices(x_values, y_values)
+                x_values = x_values[idx]
+                y_values = y_values[idx]
             
             # Create the plot
-            fig, ax = plt.subplots(figsize=(12, 8))
-            ax.plot(data[x_col] if x_col in data.columns else data.index, 
-                   data[y_col], linewidth=2, color='cyan', marker='o', markersize=4)
+            fig, ax = self._get_figure((12, 8))
+            # Per-point markers cost one path each and smear into the line on
+            # long series, so those get a sparse overlay of markers instead
+            n = len(x_values)
+            marker = 'o' if n < 500 else None
+            ax.plot(x_values, 
+                   y_values, linewidth=2, color='cyan', marker=marker, markersize=4)
+            if n >= 500:
+                idx = np.linspace(0, n - 1, 50, dtype=int)
+                ax.scatter(x_values[idx], y_values[idx], s=16, c='cyan', zorder=3)
             
             # Styling
             ax.set_xlabel(x_col if isinstance(x_col, str) else 'Index', 
@@ -158,28 +462,29 @@ class VisualizationEngine:
             ax.set_facecolor('#1a1a2e')
             fig.patch.set_facecolor('#0f0f23')
             
-            plt.tight_layout()
             return self._fig_to_base64(fig)
             
         except Exception as e:
             raise Exception(f"Line chart creation failed: {str(e)}")
     
-    def _create_pie_chart(self, data, question):
+    def _create_pie_chart(self, data, question, numeric_cols, cat_cols, date_cols):
         """Create a pie chart"""
         try:
-            # Find categorical column for pie chart
-            cat_cols = data.select_dtypes(include=['object']).columns.tolist()
-            
             if not cat_cols:
                 raise ValueError("Need categorical column for pie chart")
             
             col = cat_cols[0]
             
             # Get value counts
-            counts = data[col].value_counts().head(10)  # Top 10 categories
+            # Count integer category codes with bincount instead of hashing
+            # every string; code -1 marks missing values
+            cats = pd.Categorical(data[col])
+            codes = cats.codes[cats.codes >= 0]
+            counts = pd.Series(np.bincount(codes, minlength=len(cats.categories)),
+                               index=cats.categories).nlargest(10)  # Top 10 categories
             
             # Create the plot
-            fig, ax = plt.subplots(figsize=(10, 10))
+            fig, ax = self._get_figure((10, 10))
             colors = plt.cm.Set3(np.linspace(0, 1, len(counts)))
             
             wedges, texts, autotexts = ax.pie(counts.values, labels=counts.index, 
@@ -190,52 +495,68 @@ class VisualizationEngine:
             ax.set_title(f'Distribution of {col}', fontsize=14, color='white', pad=20)
             fig.patch.set_facecolor('#0f0f23')
             
-            plt.tight_layout()
             return self._fig_to_base64(fig)
             
         except Exception as e:
             raise Exception(f"Pie chart creation failed: {str(e)}")
     
-    def _fig_to_base64(self, fig, format='png'):
+    def _fig_to_base64(self, fig, format=None):
         """Convert matplotlib figure to base64 string"""
         try:
-            # Save to BytesIO
-            img_buffer = io.BytesIO()
-            fig.savefig(img_buffer, format=format, bbox_inches='tight', 
-                       dpi=150, facecolor='#0f0f23', edgecolor='none')
-            img_buffer.seek(0)
-            
-            # Check size and compress if necessary
-            img_data = img_buffer.getvalue()
-            if len(img_data) > 100000:  # 100KB limit
-                # Reduce quality/size
-                img_buffer.seek(0)
-                img = Image.open(img_buffer)
-                
-                # Resize if too large
-                if max(img.size) > 800:
-                    ratio = 800 / max(img.size)
-                    new_size = tuple(int(dim * ratio) for dim in img.size)
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
-                
-                # Save with compression
-                compressed_buffer = io.BytesIO()
-                img.save(compressed_buffer, format='PNG', optimize=True, quality=85)
-                img_data = compressed_buffer.getvalue()
-            
-            plt.close(fig)  # Clean up memory
+            if format is None:
+                format = 'webp' if self.prefer_webp else 'png'
+            if format not in ('png', 'webp'):
+                raise ValueError(f"Unsupported image format: {format}")
+            
+            # Render once on the Agg canvas and encode the raw RGBA buffer,
+            # skipping savefig's second render and tight-bbox pass. The dpi
+            # is capped so the longest side fits MAX_IMAGE_SIZE up front,
+            # rather than encoding a large PNG and then shrinking it
+            fig.set_dpi(min(150, MAX_IMAGE_SIZE / max(fig.get_size_inches())))
+            canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+            canvas.draw()
+            width, height = canvas.get_width_height()
+            img = Image.frombuffer('RGBA', (width, height), canvas.buffer_rgba(),
+                                   'raw', 'RGBA', 0, 1).convert('RGB')
+            
+            if format == 'webp':
+                img_buffer = io.BytesIO()
+                img.save(img_buffer, format='WEBP', quality=85, method=0)
+                img_data = img_buffer.getbuffer()
+            else:
+                # Fast compression level: encode time dominates over the extra bytes
+                img_data = _encode_png(img, level=1)
             
             # Encode to base64
             img_base64 = base64.b64encode(img_data).decode('utf-8')
-            return f"data:image/png;base64,{img_base64}"
+            return f"data:image/{format};base64,{img_base64}"
             
         except Exception as e:
-            plt.close(fig)  # Ensure cleanup
             raise Exception(f"Base64 conversion failed: {str(e)}")
+        finally:
+            self._release_figure(fig)
     
-    def create_plotly_chart(self, data, chart_type='scatter'):
+    def create_plotly_chart(self, data, chart_type='scatter', interactive=False):
         """Create interactive Plotly charts (alternative method)"""
         try:
+            # Exporting a Plotly figure to PNG launches Kaleido's headless
+            # Chromium; unless asked for Plotly, draw the first two columns
+            # with the matching matplotlib chart instead
+            if not interactive:
+                renderers = {
+                    'scatter': self._create_scatterplot,
+                    'bar': self._create_bar_chart,
+                    'line': self._create_line_chart,
+                }
+                if chart_type not in renderers:
+                    raise ValueError(f"Unsupported chart type: {chart_type}")
+                try:
+                    subset = data.iloc[:, :2]
+                    return renderers[chart_type](subset, chart_type, *_dtype_columns(subset))
+                except Exception:
+                    # Column types the matplotlib charts can't handle; use Plotly
+                    pass
+            
             if chart_type == 'scatter':
                 fig = px.scatter(data, x=data.columns[0], y=data.columns[1],
                                title=f"{data.columns[1]} vs {data.columns[0]}")
@@ -243,6 +564,8 @@ class VisualizationEngine:
                 fig = px.bar(data, x=data.columns[0], y=data.columns[1])
             elif chart_type == 'line':
                 fig = px.line(data, x=data.columns[0], y=data.columns[1])
+            else:
+                raise ValueError(f"Unsupported chart type: {chart_type}")
             
             # Update layout for dark theme
             fig.update_layout(
@@ -0,0 +1,12 @@
+import os
+import sys
+import types
+
+# Register src/ as a package without running its __init__, which pulls in
+# the Gemini client and analyzer that these unit tests don't need
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+if 'src' not in sys.modules:
+    package = types.ModuleType('src')
+    package.__path__ = [os.path.join(ROOT, 'src')]
+    sys.modules['src'] = package
@@ -0,0 +1,77 @@
+import io
+
+import numpy as np
+
+from src.cache import ResponseCache
+
+
+class FakeRedis:
+    """In-memory stand-in for the few redis.Redis methods the cache uses"""
+
+    def __init__(self, fail=False):
+        self.store = {}
+        self.fail = fail
+
+    def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+
+
+def make_cache(**kwargs):
+    cache = ResponseCache(**kwargs)
+    cache.client = FakeRedis()
+    return cache
+
+
+def test_disabled_without_url():
+    cache = ResponseCache(url=None)
+    assert not cache.enabled
+    cache.set('k', {'a': 1})
+    assert cache.get('k') is None
+
+
+def test_round_trip_keeps_numpy_types_native():
+    cache = make_cache()
+    cache.set('k', {'answer': np.int64(5), 'arr': np.arange(3), 1: 'one'})
+
+    assert cache.get('k') == {'answer': 5, 'arr': [0, 1, 2], '1': 'one'}
+
+
+def test_miss_returns_none():
+    assert make_cache().get('missing') is None
+
+
+def test_default_handles_unserializable_values():
+    cache = make_cache(default=lambda obj: sorted(obj))
+    cache.set('k', {'tags': {'b', 'a'}})
+
+    assert cache.get('k') == {'tags': ['a', 'b']}
+
+
+def test_client_errors_are_swallowed():
+    cache = ResponseCache()
+    cache.client = FakeRedis(fail=True)
+
+    cache.set('k', {'a': 1})
+    assert cache.get('k') is None
+
+
+def test_make_key_depends_on_questions_and_files_and_rewinds():
+    cache = make_cache()
+    a = io.BytesIO(b'x,y\n1,2\n')
+    b = io.BytesIO(b'x,y\n1,3\n')
+
+    key = cache.make_key('q', {'data.csv': a})
+
+    assert key.startswith('analysis:')
+    assert a.tell() == 0
+    assert key == cache.make_key('q', {'data.csv': a})
+    assert key != cache.make_key('other', {'data.csv': a})
+    assert key != cache.make_key('q', {'data.csv': b})
+    assert key != cache.make_key('q', {'other.csv': a})
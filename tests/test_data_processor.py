@@ -0,0 +1,118 @@
+import io
+
+import pandas as pd
+import pytest
+
+from src.data_processor import DataProcessor
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'name': ['Avatar', 'Titanic', 'Avengers: Endgame', 'Star Wars', None],
+        'gross': [2.9, 2.2, 2.8, 2.1, 1.5],
+        'year': [2009, 1997, 2019, 2015, 2000],
+    })
+
+
+def test_filter_data_combines_conditions(df):
+    out = DataProcessor().filter_data(df, {
+        'gross': {'min': 2.0, 'max': 2.85},
+        'year': {'min': 2000},
+    })
+
+    assert out['name'].tolist() == ['Avengers: Endgame', 'Star Wars']
+
+
+def test_filter_data_conditions_across_columns_are_anded(df):
+    out = DataProcessor().filter_data(df, {
+        'year': {'equals': 2009},
+        'gross': {'max': 2.0},
+    })
+
+    assert out.empty
+
+
+def test_filter_data_literal_contains_is_case_insensitive(df):
+    out = DataProcessor().filter_data(df, {'name': {'contains': 'AVA'}})
+
+    assert out['name'].tolist() == ['Avatar']
+
+
+def test_filter_data_regex_contains(df):
+    out = DataProcessor().filter_data(df, {'name': {'contains': '^(?:titanic|star)'}})
+
+    assert out['name'].tolist() == ['Titanic', 'Star Wars']
+
+
+def test_filter_data_ignores_unknown_columns_and_empty_filters(df):
+    processor = DataProcessor()
+
+    assert processor.filter_data(df, {'missing': {'min': 1}}).equals(df)
+    assert processor.filter_data(df, {}).equals(df)
+
+
+def test_filter_data_treats_missing_nullable_values_as_no_match():
+    df = pd.DataFrame({
+        'x': pd.array([1, None, 3], dtype='Int64'),
+        's': pd.array(['a', 'b', None], dtype='string'),
+    })
+    processor = DataProcessor()
+
+    assert processor.filter_data(df, {'x': {'min': 2}})['x'].tolist() == [3]
+    assert processor.filter_data(df, {'x': {'max': 2}})['x'].tolist() == [1]
+    assert processor.filter_data(df, {'x': {'equals': 3}})['x'].tolist() == [3]
+    assert processor.filter_data(df, {'s': {'contains': 'b'}})['s'].tolist() == ['b']
+
+
+def test_get_data_summary_categorical_counts_any_column_names():
+    df = pd.DataFrame({
+        'value': ['a', 'b', 'a', 'a'],
+        'variable': ['x', 'x', 'y', None],
+        '_value': ['p', 'q', 'q', 'q'],
+        'n': [1, 2, 3, 4],
+    })
+
+    summary = DataProcessor().get_data_summary(df)
+
+    assert 'error' not in summary
+    cats = summary['categorical_summary']
+    assert cats['value'] == {'unique_count': 2, 'top_values': {'a': 3, 'b': 1}}
+    assert cats['variable'] == {'unique_count': 2, 'top_values': {'x': 2, 'y': 1}}
+    assert cats['_value'] == {'unique_count': 2, 'top_values': {'q': 3, 'p': 1}}
+
+
+def test_process_csv_reads_utf8():
+    data = 'city,word\nMünchen,naïve\nTōkyō,café\n'.encode('utf-8')
+
+    df = DataProcessor()._process_csv(io.BytesIO(data))
+
+    assert df['city'].tolist() == ['München', 'Tōkyō']
+    assert df['word'].tolist() == ['naïve', 'café']
+
+
+def test_process_csv_reads_short_cp1252():
+    data = 'name,word\nx,café\ny,naïve\n'.encode('cp1252')
+
+    df = DataProcessor()._process_csv(io.BytesIO(data))
+
+    assert df['word'].tolist() == ['café', 'naïve']
+
+
+def test_process_csv_retries_latin1_for_bytes_past_the_sample():
+    # The sniffed sample is pure ASCII (so UTF-8); the bad byte comes later
+    rows = ''.join(f'{i},plain\n' for i in range(10000))
+    data = ('id,word\n' + rows).encode('ascii') + b'10000,caf\xe9\n'
+    assert len(data) > 65536
+
+    df = DataProcessor()._process_csv(io.BytesIO(data))
+
+    assert len(df) == 10001
+    assert df['word'].iloc[-1] == 'café'
+
+
+def test_read_csv_raises_for_columns_arrow_cannot_decode():
+    data = b'id,word\n1,caf\xe9\n'
+
+    with pytest.raises(UnicodeDecodeError):
+        DataProcessor()._read_csv(io.BytesIO(data), 'utf-8')
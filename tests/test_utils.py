@@ -0,0 +1,141 @@
+import io
+import os
+from tempfile import SpooledTemporaryFile
+
+import chardet
+import pytest
+
+from src import utils
+from src.utils import Utils
+
+
+PAGE = """
+<html><body>
+<table class="layout"><tr><td><img src="logo.png"></td></tr></table>
+<table>
+  <tr><th>Rank</th><th>Title</th></tr>
+  <tr><td>1</td><td>Avatar</td></tr>
+  <tr><td>2</td><td>Titanic</td></tr>
+</table>
+<table>
+  <tr><th>Year</th></tr>
+  <tr><td>2009</td></tr>
+</table>
+</body></html>
+"""
+
+
+class FakeResponse:
+    text = PAGE
+
+
+@pytest.fixture(params=['lexbor', 'pandas'])
+def scrape(request, monkeypatch, tmp_path):
+    if request.param == 'pandas':
+        monkeypatch.setattr(utils, 'LexborHTMLParser', None)
+    elif utils.LexborHTMLParser is None:
+        pytest.skip("selectolax not installed")
+    monkeypatch.setattr(utils, 'SCRAPE_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(Utils, 'safe_request', staticmethod(lambda url, **kwargs: FakeResponse()))
+    return Utils.scrape_table
+
+
+def test_scrape_table_skips_tables_without_text(scrape):
+    df = scrape('https://example.com/films', 0)
+
+    assert df.columns.tolist() == ['Rank', 'Title']
+    assert df['Title'].tolist() == ['Avatar', 'Titanic']
+
+
+def test_scrape_table_indexes_later_tables(scrape):
+    df = scrape('https://example.com/films', 1)
+
+    assert df['Year'].tolist() == [2009]
+
+
+def test_scrape_table_missing_index_raises(scrape):
+    with pytest.raises(ValueError):
+        scrape('https://example.com/films', 2)
+
+
+def test_detect_encoding_utf8_even_when_sample_splits_a_character():
+    sample = 'naïve café'.encode('utf-8')[:-1]
+
+    assert Utils.detect_encoding(sample) == 'utf-8'
+
+
+def test_detect_encoding_falls_back_when_chardet_is_unsure(monkeypatch):
+    monkeypatch.setattr(chardet, 'detect', lambda data: {'encoding': 'ISO-8859-4', 'confidence': 0.02})
+
+    assert Utils.detect_encoding('café/naïve'.encode('latin-1')) == utils.DEFAULT_ENCODING
+
+
+def test_detect_encoding_trusts_confident_guesses(monkeypatch):
+    monkeypatch.setattr(chardet, 'detect', lambda data: {'encoding': 'KOI8-R', 'confidence': 0.99})
+
+    assert Utils.detect_encoding('Привет'.encode('koi8-r')) == 'KOI8-R'
+
+
+PAYLOAD = bytes(range(256)) * 4096  # 1MB
+
+
+def test_save_upload_copies_bytesio(tmp_path):
+    src = io.BytesIO(PAYLOAD)
+    src.read(100)  # A partly read stream is still copied from the start
+    dst = tmp_path / 'out.bin'
+
+    assert Utils.save_upload(src, str(dst)) == len(PAYLOAD)
+    assert dst.read_bytes() == PAYLOAD
+
+
+def test_save_upload_keeps_small_spool_in_memory(tmp_path):
+    src = SpooledTemporaryFile(max_size=len(PAYLOAD) * 2, mode='rb+')
+    src.write(PAYLOAD)
+    dst = tmp_path / 'out.bin'
+
+    assert Utils.save_upload(src, str(dst)) == len(PAYLOAD)
+    assert dst.read_bytes() == PAYLOAD
+    assert not src._rolled
+
+
+@pytest.mark.skipif(not hasattr(os, 'sendfile'), reason="needs os.sendfile")
+def test_save_upload_sendfile_from_rolled_spool(tmp_path, monkeypatch):
+    calls = []
+    real_sendfile = os.sendfile
+
+    def spy(*args):
+        calls.append(args)
+        return real_sendfile(*args)
+
+    monkeypatch.setattr(os, 'sendfile', spy)
+    src = SpooledTemporaryFile(max_size=1024, mode='rb+')
+    src.write(PAYLOAD)
+    assert src._rolled
+    dst = tmp_path / 'out.bin'
+
+    assert Utils.save_upload(src, str(dst)) == len(PAYLOAD)
+    assert dst.read_bytes() == PAYLOAD
+    assert calls or not utils.sys.platform.startswith('linux')
+
+
+def test_save_upload_falls_back_when_sendfile_fails(tmp_path, monkeypatch):
+    def fail(*args):
+        raise OSError("sendfile not supported")
+
+    monkeypatch.setattr(os, 'sendfile', fail, raising=False)
+    src = SpooledTemporaryFile(max_size=1024, mode='rb+')
+    src.write(PAYLOAD)
+    dst = tmp_path / 'out.bin'
+
+    assert Utils.save_upload(src, str(dst)) == len(PAYLOAD)
+    assert dst.read_bytes() == PAYLOAD
+
+
+def test_save_upload_unwraps_upload_objects(tmp_path):
+    class Upload:
+        stream = io.BytesIO(PAYLOAD)
+
+    dst = tmp_path / 'out.bin'
+
+    assert Utils.save_upload(Upload(), str(dst)) == len(PAYLOAD)
+    assert dst.read_bytes() == PAYLOAD
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from src.visualization import DOWNSAMPLE_TARGET, _m4_indices, _sample_indices
+
+
+def test_sample_indices_sorted_unique_and_deterministic():
+    idx = _sample_indices(20000)
+    assert idx.size == DOWNSAMPLE_TARGET
+    assert np.all(np.diff(idx) > 0)
+    assert idx.min() >= 0 and idx.max() < 20000
+    np.testing.assert_array_equal(idx, _sample_indices(20000))
+
+
+def test_m4_keeps_first_last_and_extremes():
+    rng = np.random.default_rng(1)
+    n = 20000
+    x = np.arange(n, dtype=np.float64)
+    y = rng.normal(size=n)
+    y[1234] = 50.0
+    y[9876] = -50.0
+
+    idx = _m4_indices(x, y)
+
+    assert np.all(np.diff(idx) > 0)
+    assert idx.size <= DOWNSAMPLE_TARGET
+    assert {0, n - 1, 1234, 9876} <= set(idx.tolist())
+
+
+def test_m4_keeps_each_bucket_min_and_max():
+    rng = np.random.default_rng(2)
+    n = 10000
+    x = np.sort(rng.uniform(0, 1, size=n))
+    y = rng.normal(size=n)
+    target = 40  # 10 buckets
+
+    kept = set(_m4_indices(x, y, target=target).tolist())
+
+    buckets = np.minimum(((x - x.min()) / (x.max() - x.min()) * 10).astype(int), 9)
+    for b in range(10):
+        rows = np.flatnonzero(buckets == b)
+        assert rows[0] in kept and rows[-1] in kept
+        assert rows[np.argmin(y[rows])] in kept
+        assert rows[np.argmax(y[rows])] in kept
+
+
+def test_m4_ignores_nan_y_when_picking_extremes():
+    n = 10000
+    x = np.arange(n, dtype=np.float64)
+    y = np.sin(x / 100)
+    y[::7] = np.nan
+    y[500] = 10.0
+    y[4000] = -10.0
+
+    kept = set(_m4_indices(x, y).tolist())
+
+    assert {500, 4000} <= kept
+
+
+def test_m4_drops_rows_with_non_finite_x():
+    n = 10000
+    x = np.arange(n, dtype=np.float64)
+    x[:10] = np.nan
+    y = np.zeros(n)
+
+    idx = _m4_indices(x, y)
+
+    assert idx.min() == 10
+    assert idx.max() == n - 1
+
+
+def test_m4_constant_x_uses_even_stride():
+    n = 10000
+    idx = _m4_indices(np.full(n, 3.0), np.arange(n, dtype=np.float64))
+
+    assert idx.size == DOWNSAMPLE_TARGET
+    assert idx[0] == 0 and idx[-1] == n - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_m4_non_numeric_falls_back_to_even_stride():
+    n = 10000
+    x = np.array([f"label{i}" for i in range(n)], dtype=object)
+    y = np.arange(n, dtype=np.float64)
+
+    idx = _m4_indices(x, y)
+
+    np.testing.assert_array_equal(idx, np.linspace(0, n - 1, DOWNSAMPLE_TARGET, dtype=np.int64))
+
+
+def test_m4_datetime_x_keeps_extremes():
+    n = 10000
+    x = pd.date_range('2024-01-01', periods=n, freq='min').to_numpy()
+    y = np.cos(np.arange(n) / 50.0)
+    y[2500] = 5.0
+
+    idx = _m4_indices(x, y)
+
+    assert {0, n - 1, 2500} <= set(idx.tolist())
+    assert idx.size <= DOWNSAMPLE_TARGET
@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production servers.
+
+gevent must patch the standard library before Flask, requests or urllib3
+are imported so that outbound HTTP calls (Gemini, scraping) yield to other
+requests instead of blocking the worker.
+"""
+from gevent import monkey
+monkey.patch_all()
+
+from app import app  # noqa: E402
+
+if __name__ == '__main__':
+    app.run()